@@ -1,11 +1,36 @@
 import json
 import logging
 import os
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, Generator, List
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 
+WRITE_BUFFER_SIZE = 1 << 20
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+READ_AHEAD = 2 * READ_WORKERS
+O_BINARY = getattr(os, "O_BINARY", 0)
+LINE_SEPARATOR = os.linesep.encode("ascii")
+CARRIAGE_RETURNS = re.compile(rb"\r\n?")
+
+# UTF-8 encodings of every character str.isspace() accepts, except "\n".
+LEADING_WHITESPACE = (
+    rb"(?:[\t\v\f\r\x1c-\x1f ]"
+    rb"|\xc2[\x85\xa0]"
+    rb"|\xe1\x9a\x80"
+    rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]"
+    rb"|\xe2\x81\x9f"
+    rb"|\xe3\x80\x80)*"
+)
+
 
 BlockCommentType = Dict[str, Dict[str, str]]
 InlineCommentType = Dict[str, str]
@@ -14,6 +39,22 @@ ConfigDataType = BlockCommentType | InlineCommentType | FiltersType | str
 ProjectConfigType = Dict[str, str] | str
 LanguageSyntaxType = Dict[str, Dict[str, str] | str]
 
+_PYTHON_SYNTAX: LanguageSyntaxType = {
+    "block_comment": {"open": '"""', "close": '"""'},
+    "inline_comment": "#",
+}
+_JAVASCRIPT_SYNTAX: LanguageSyntaxType = {
+    "block_comment": {"open": "/*", "close": "*/"},
+    "inline_comment": "//",
+}
+_DEFAULT_LANGUAGE_SYNTAX: LanguageSyntaxType = _JAVASCRIPT_SYNTAX
+_LANGUAGE_SYNTAX: Dict[str, LanguageSyntaxType] = {
+    "python": _PYTHON_SYNTAX,
+    "py": _PYTHON_SYNTAX,
+    "javascript": _JAVASCRIPT_SYNTAX,
+    "js": _JAVASCRIPT_SYNTAX,
+}
+
 
 @dataclass
 class LanguageSyntax:
@@ -62,89 +103,194 @@ class FileMerger:
         self.skip_files: List[str] = config.skip_files
         self.allowed_extensions: List[str] = config.allowed_extensions
         self.block_comment: Dict[str, Dict[str, str]] = config.block_comment
-        self.inline_comment: Dict[str, str] = config.inline_comment
+
+        if not isinstance(config.inline_comment, str):
+            raise TypeError('Expected "inline_comment" to be a string')
+
+        self.inline_comment: str = config.inline_comment
+
+        self._allowed_exts: Tuple[str, ...] = tuple(
+            ext.lower() for ext in self.allowed_extensions
+        )
+        self._skip_files: FrozenSet[str] = frozenset(self.skip_files)
+        self._skip_folders: FrozenSet[str] = frozenset(self.skip_folders)
+        self._comment_lines: re.Pattern[bytes] = re.compile(
+            rb"^"
+            + LEADING_WHITESPACE
+            + re.escape(self.inline_comment.encode("utf-8"))
+            + rb"[^\n]*\n?",
+            re.MULTILINE,
+        )
+        self._header_prefix: bytes = (
+            f"```\n{self.block_comment['open']}\nfile: ".encode("utf-8")
+        )
+        self._header_suffix: bytes = (
+            f"\n{self.block_comment['close']}\n".encode("utf-8")
+        )
+        self._tail: bytes = b"\n```\n\n"
+
+        if LINE_SEPARATOR != b"\n":
+            self._header_prefix = self._header_prefix.replace(
+                b"\n", LINE_SEPARATOR
+            )
+            self._header_suffix = self._header_suffix.replace(
+                b"\n", LINE_SEPARATOR
+            )
+            self._tail = self._tail.replace(b"\n", LINE_SEPARATOR)
 
     def start(self) -> None:
         """
         Starts the file processing by walking through the directory and writing
         the content of allowed files to the output file.
+
+        Files are read concurrently in a thread pool, but their content is
+        written in walking order so the output is deterministic.
         """
         os.makedirs(self.output_dir, exist_ok=True)
         output_file = f"{self.output_filename}.{self.output_extension}"
         output_path = os.path.join(self.output_dir, output_file)
 
-        lines = self.walk_directory(self.root_path, self.project_dir)
-        try:
-            with open(output_path, "w+") as f:
-                for line in lines:
-                    f.write(line)
-        except IOError as e:
-            logging.error(f"Error writing to file {output_path}: {e}")
+        project_path = os.path.join(self.root_path, self.project_dir)
+        file_paths: List[str] = self.walk_directory(project_path)
+
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            self.write_output(
+                output_path,
+                (
+                    chunk
+                    for file_path, content in self.read_files(
+                        executor, file_paths
+                    )
+                    for chunk in self.handle_file(file_path, content)
+                ),
+            )
 
-    def walk_directory(
-        self, path: str, dir: str
-    ) -> Generator[str, None, None]:
+    def read_files(
+        self, executor: ThreadPoolExecutor, file_paths: List[str]
+    ) -> Iterator[Tuple[str, bytearray]]:
         """
-        Walks through the directory and yields lines from allowed files.
+        Reads the files in the thread pool and yields their content in order.
+
+        At most READ_AHEAD reads are in flight or waiting to be consumed, so
+        readers cannot run arbitrarily far ahead of the writer and memory
+        use does not grow with the size of the project.
 
         Args:
-            path (str): The current directory path.
-            dir (str): The directory to walk through.
+            executor (ThreadPoolExecutor): The pool to read the files in.
+            file_paths (List[str]): The paths of the files to read.
 
         Yields:
-            str: Lines from allowed files.
+            Tuple[str, bytearray]: Each file path with its filtered content.
         """
-        next_path = os.path.join(path, dir)
-        try:
-            files = os.listdir(next_path)
-        except OSError as e:
-            logging.error(f"Error accessing directory {next_path}: {e}")
-            return
-
-        for file in files:
-            yield from self.handle_file(next_path, file)
-
-    def handle_file(self, path: str, file: str) -> Generator[str, None, None]:
+        pending: Deque[Tuple[str, Future]] = deque()
+        for file_path in file_paths:
+            future = executor.submit(self.read_file, file_path)
+            pending.append((file_path, future))
+            if len(pending) >= READ_AHEAD:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+    def write_output(
+        self, output_path: str, chunks: Iterable[bytes | bytearray]
+    ) -> None:
         """
-        Handles a single file or directory, yielding lines from allowed files.
+        Writes the chunks to the output file through a raw file descriptor.
+        Small chunks are copied into a reusable buffer that is flushed in
+        WRITE_BUFFER_SIZE blocks; chunks at least that large are written
+        directly so the buffer never grows past its limit.
 
         Args:
-            path (str): The current directory path.
-            file (str): The file or directory to handle.
+            output_path (str): The path of the output file.
+            chunks (Iterable[bytes | bytearray]): The chunks to write, in
+            order.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY
+        buffer = bytearray()
+        try:
+            fd = os.open(output_path, flags, 0o644)
+            try:
+                for chunk in chunks:
+                    if len(chunk) >= WRITE_BUFFER_SIZE:
+                        write_all(fd, buffer)
+                        buffer.clear()
+                        write_all(fd, chunk)
+                        continue
+                    buffer += chunk
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        write_all(fd, buffer)
+                        buffer.clear()
+                write_all(fd, buffer)
+            finally:
+                os.close(fd)
+        except IOError as e:
+            logging.error(f"Error writing to file {output_path}: {e}")
 
-        Yields:
-            str: Lines from allowed files.
+    def walk_directory(self, path: str) -> List[str]:
         """
-        if file in self.skip_folders:
-            return
+        Walks through the directory and collects the paths of allowed files.
 
-        new_file = os.path.join(path, file)
+        Walking is kept separate from reading so the full list of files is
+        known before any of them are opened. Skipped folders are pruned
+        before they are descended into.
 
-        if os.path.isdir(new_file):
-            yield from self.walk_directory(path, file)
+        Args:
+            path (str): The directory path to walk through.
 
-        if self.go_to_next_file(file):
-            return
+        Returns:
+            List[str]: Paths of allowed files, in walking order.
+        """
+        file_paths: List[str] = []
+        for root, dirs, files in os.walk(path, onerror=log_walk_error):
+            dirs[:] = [d for d in dirs if d not in self._skip_folders]
+
+            prefix = os.path.join(root, "")
+            file_paths.extend(
+                prefix + file
+                for file in files
+                if not self.go_to_next_file(file)
+            )
 
-        header = (
-            f"```\n{self.block_comment['open']}\nfile: "
-            + f"{new_file}\n{self.block_comment['close']}\n"
-        )
-        yield header
+        return file_paths
 
-        lines: Generator[str, None, None] = self.read_file(new_file)
+    def handle_file(
+        self, file_path: str, content: bytearray
+    ) -> List[bytes | bytearray]:
+        """
+        Handles a single allowed file, wrapping its content in a header and
+        tail.
 
-        inline_comment: Dict[str, str] | str = self.inline_comment
+        The content is returned as its own chunk rather than joined with the
+        header, so it is not copied into an intermediate joined buffer. On
+        platforms whose line separator is not LF, line breaks in the path
+        and content are translated here; the header and tail bytes are
+        translated once in __init__.
 
-        if not isinstance(inline_comment, str):
-            raise TypeError('Expected "inline_comment" to be a string')
+        Args:
+            file_path (str): The path of the file to handle.
+            content (bytearray): The filtered content of the file.
 
-        yield from [
-            l for l in lines if not l.lstrip().startswith(inline_comment)
+        Returns:
+            List[bytes | bytearray]: The header, content and tail of the
+            file.
+        """
+        path = file_path.encode("utf-8", "surrogateescape")
+
+        if LINE_SEPARATOR != b"\n":
+            path = path.replace(b"\n", LINE_SEPARATOR)
+            content = content.replace(b"\n", LINE_SEPARATOR)
+
+        return [
+            self._header_prefix,
+            path,
+            self._header_suffix,
+            content,
+            self._tail,
         ]
 
-        yield "\n```\n\n"
-
     def go_to_next_file(self, file: str) -> bool:
         """
         Determines whether to skip the file based on its extension and name.
@@ -156,32 +302,94 @@ class FileMerger:
             bool: True if the file should be skipped, False otherwise.
         """
         return (
-            not any(file.endswith(ext) for ext in self.allowed_extensions)
-            or file in self.skip_files
+            not file.lower().endswith(self._allowed_exts)
+            or file in self._skip_files
         )
 
-    def read_file(self, new_file: str) -> Generator[str, None, None]:
+    def read_file(self, new_file: str) -> bytearray:
         """
-        Reads the content of a file.
+        Reads a file in a single call and returns its content without
+        inline-comment lines. Line breaks are normalized to LF, as
+        universal newlines mode would.
+
+        The file is read into memory rather than memory-mapped: a mapped file
+        that is truncated while it is scanned, for example by an editor save,
+        kills the process with SIGBUS. The bytes are then scanned by
+        strip_comment_lines as they would be through a mapping.
 
         Args:
             new_file (str): The file path.
 
         Returns:
-            List[str]: A list of lines from the file.
+            bytearray: The filtered content of the file, or an empty buffer
+            if it could not be read.
         """
         try:
-            with open(new_file, "r") as f:
-                for line in f:
-                    yield line
-
+            with open(new_file, "rb") as f:
+                data = f.read()
         except IOError as e:
             logging.error(f"Error reading file {new_file}: {e}")
+            return bytearray()
+
+        if b"\r" in data:
+            data = CARRIAGE_RETURNS.sub(b"\n", data)
+
+        return strip_comment_lines(data, self._comment_lines)
+
+
+def strip_comment_lines(
+    data: bytes, comment_lines: re.Pattern[bytes]
+) -> bytearray:
+    """
+    Removes inline-comment lines from the data, copying the kept ranges
+    between comment lines straight into a single buffer through a
+    memoryview, without building intermediate slices.
+
+    Args:
+        data (bytes): The raw content of a file.
+        comment_lines (re.Pattern[bytes]): A multiline pattern matching whole
+        inline-comment lines, including their line break.
+
+    Returns:
+        bytearray: The content without inline-comment lines.
+    """
+    kept = bytearray()
+    start = 0
+    with memoryview(data) as view:
+        for match in comment_lines.finditer(data):
+            kept += view[start : match.start()]
+            start = match.end()
+        kept += view[start:]
+    return kept
+
+
+def log_walk_error(error: OSError) -> None:
+    """
+    Logs a directory that could not be listed while walking the project.
+
+    Args:
+        error (OSError): The error raised by os.walk.
+    """
+    logging.error(f"Error accessing directory {error.filename}: {error}")
+
+
+def write_all(fd: int, data: bytes | bytearray) -> None:
+    """
+    Writes all of the data to a file descriptor, retrying on partial writes.
+
+    Args:
+        fd (int): The file descriptor to write to.
+        data (bytes | bytearray): The data to write.
+    """
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
 
 
 def load_json(file_path: str) -> Dict:
     """
-    Loads a JSON file and returns its content.
+    Loads a JSON file and returns its content, using orjson when it is
+    installed and the standard library parser otherwise.
 
     Args:
         file_path (str): The path to the JSON file.
@@ -190,8 +398,9 @@ def load_json(file_path: str) -> Dict:
         Dict: The content of the JSON file.
     """
     try:
-        with open(file_path, "r") as file:
-            return json.load(file)
+        with open(file_path, "rb") as file:
+            data = file.read()
+        return orjson.loads(data) if orjson else json.loads(data)
     except (IOError, json.JSONDecodeError) as e:
         logging.error(f"Error loading JSON file {file_path}: {e}")
         return {}
@@ -205,42 +414,16 @@ def get_language_syntax(project_language: str) -> LanguageSyntaxType:
     Returns:
         str: The comment syntax.
     """
-    match project_language.lower():
-        case "python" | "py":
-            return {
-                "block_comment": {"open": '"""', "close": '"""'},
-                "inline_comment": "#",
-            }
-        case "javascript" | "js":
-            return {
-                "block_comment": {"open": "/*", "close": "*/"},
-                "inline_comment": "//",
-            }
-        case _:
-            logging.warning(
-                f"Unknown project language: '{project_language}'. "
-                "Final syntax may not be accurate."
-            )
-            return {
-                "block_comment": {"open": "/*", "close": "*/"},
-                "inline_comment": "//",
-            }
-
-
-def unpack_dict_to_dataclass(data: Dict[str, ConfigDataType]) -> Config:
-    """
-    Converts a dictionary to a Config data class instance.
+    language_syntax = _LANGUAGE_SYNTAX.get(project_language.lower())
 
-    Args:
-        data (Dict[str, ConfigDataType]): The dictionary containing
-        configuration data.
+    if language_syntax is None:
+        logging.warning(
+            f"Unknown project language: '{project_language}'. "
+            "Final syntax may not be accurate."
+        )
+        return _DEFAULT_LANGUAGE_SYNTAX
 
-    Returns:
-        Config: An instance of the Config data class.
-    """
-    sanitized_data: dict = {}
-    sanitized_data.update(data)
-    return Config(**sanitized_data)
+    return language_syntax
 
 
 def run() -> None:
@@ -254,10 +437,14 @@ def run() -> None:
         "project_config": "project_config.json",
     }
 
-    config_data: Dict[str, ConfigDataType] = {
-        key: load_json(os.path.join("config", path))
-        for key, path in config_files.items()
-    }
+    config_paths: List[str] = [
+        os.path.join("config", path) for path in config_files.values()
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(config_paths)) as executor:
+        config_data: Dict[str, ConfigDataType] = dict(
+            zip(config_files, executor.map(load_json, config_paths))
+        )
 
     project_config: ConfigDataType = config_data.pop("project_config")
 
@@ -271,7 +458,7 @@ def run() -> None:
 
     language_syntax: LanguageSyntaxType = get_language_syntax(project_language)
     config_data.update(project_config, **language_syntax)
-    typed_config: Config = unpack_dict_to_dataclass(config_data)
+    typed_config: Config = Config(**config_data)
 
     file_merger = FileMerger(typed_config)
     file_merger.start()